@@ -3,19 +3,145 @@ Trading Signal Evaluation Module
 
 This module evaluates market data and technical indicators to generate
 trading signals with risk management parameters.
+
+Four entry points are provided:
+    - evaluate_signal(data): validates a single bar and returns a signal dict
+    - evaluate_signal_batch(arrays): evaluates many bars at once using
+      elementwise NumPy operations (for backtesting workloads)
+    - evaluate_signals_batch(arrays): the same vectorized evaluation, returned
+      as one SignalResult (with message) per bar
+    - backtest_signals(arrays): a bar series evaluated by the compiled
+      numeric core in a parallel (multi-core) loop
 """
 
-from typing import Dict, Any, Optional
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # pragma: no cover - only needed by the mypyc build
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Any:  # type: ignore[misc]
+        """
+        Fallback decorator used when mypy_extensions is unavailable: returns
+        the class unchanged.
+        """
+        return lambda cls: cls
+
+from agent_core import (
+    CANDLE_CODES,
+    PATTERN_CODES,
+    CANDLE_NAMES,
+    PATTERN_NAMES,
+    BULLISH_CANDLE_CODES,
+    BEARISH_CANDLE_CODES,
+    BULLISH_PATTERN_CODES,
+    BEARISH_PATTERN_CODES,
+    REASON_ALL_CONDITIONS_MET,
+    REASON_NOT_ENOUGH_CONFLUENCES,
+    REASON_CONFIDENCE_TOO_LOW,
+    REASON_INVALID_RISK_PARAMETERS,
+    REASONS,
+    FLAG_BULLISH,
+    FLAG_RSI,
+    FLAG_CANDLE,
+    FLAG_PATTERN,
+    FLAG_TREND,
+    RSI_OVERSOLD,
+    RSI_OVERBOUGHT,
+    RSI_OVERSOLD_STRICT,
+    RSI_OVERBOUGHT_STRICT,
+    PRICE_SCALE,
+    RRR_SCALE,
+    LEVEL_QUALITY_SCORE,
+    MARKET_CONDITIONS_SCORE,
+    BULL_TREND_THRESHOLDS,
+    BULL_TREND_SCORES,
+    BEAR_TREND_THRESHOLDS,
+    BEAR_TREND_SCORES,
+    CANDLE_SCORES,
+    NO_CANDLE_SCORE,
+    _evaluate_core_normal,
+    _evaluate_core_strict,
+    _backtest_core,
+)
+
+# Optional native build of the scalar kernels (rust/signal_core/, Rust + PyO3):
+# same arguments and return tuple as the Numba kernels, without Numba's
+# per-call type dispatch. The batch and backtest paths always use NumPy/Numba.
+try:
+    from signal_core import (  # type: ignore[import-not-found]
+        evaluate_core_normal as _scalar_core_normal,
+        evaluate_core_strict as _scalar_core_strict,
+    )
+except ImportError:  # native core not built - use the Numba kernels
+    _scalar_core_normal = _evaluate_core_normal
+    _scalar_core_strict = _evaluate_core_strict
+
+
+# Required fields for signal evaluation, in message order
+_REQUIRED_FIELDS = (
+    "instrument",      # Trading symbol (e.g., "EURUSD", "BTCUSD")
+    "timeframe",       # Chart timeframe (must be "4H")
+    "close",           # Current closing price
+    "high",            # Current/recent high price
+    "low",             # Current/recent low price
+    "rsi_4h",          # RSI indicator on 4H timeframe
+    "rsi_daily",       # RSI indicator on daily timeframe
+    "atr",             # Average True Range for volatility
+    "ema50_daily",     # 50-period EMA on daily timeframe
+)
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+
+# Optional fields and their defaults, in unpacking order
+_OPTIONAL_DEFAULTS: Dict[str, Any] = {
+    "candle_type": None,        # Candlestick pattern name (or code)
+    "pattern": None,            # Chart pattern name (or code)
+    "divergence": False,        # Price/RSI divergence present
+    "strict_mode": False,       # Use extreme RSI thresholds
+    "recent_swing_low": None,   # Structure level for long stops
+    "recent_swing_high": None,  # Structure level for short stops
+    "include_message": True,    # Build the human-readable message
+}
 
 
-def evaluate_signal(data: Dict[str, Any]) -> Dict[str, Any]:
+# Kept a regular Python class under mypyc (native_class=False): a native
+# class has neither __slots__ nor __dict__, which orjson needs to serialize
+# the dataclass
+@mypyc_attr(native_class=False)
+@dataclass(slots=True)
+class SignalResult:
+    """
+    Trade decision returned by evaluate_signal.
+
+    A fixed-shape slotted dataclass rather than a dict: much smaller when
+    millions of results are held (e.g. backtests), attribute access is a
+    fixed offset, and FastAPI/orjson serialize it directly.
+    """
+    status: str                   # "long", "short" or "no_trade"
+    reason: str                   # Explanation code for the decision
+    entry: Optional[float]        # Entry price level
+    stop_loss: Optional[float]    # Stop loss price level
+    take_profit: Optional[float]  # Take profit price level
+    rrr: Optional[float]          # Risk-to-reward ratio
+    confidence: float             # Confidence percentage (0-100)
+    message: str                  # Summary of trade setup / reason details
+    instrument: Optional[str]     # Trading instrument
+    timeframe: Optional[str]      # Chart timeframe
+    timestamp: Any                # Signal timestamp
+
+
+def evaluate_signal(data: Dict[str, Any]) -> SignalResult:
     """
     Evaluate market data and indicators to generate a trading signal.
-    
+
     This function analyzes the provided market data including price action,
     technical indicators, and market conditions to determine whether to
     enter a trade (long/short) or stay out of the market.
-    
+
     Args:
         data (dict): A dictionary containing market and indicator data with keys:
             - instrument (str): Trading instrument symbol
@@ -23,9 +149,11 @@ def evaluate_signal(data: Dict[str, Any]) -> Dict[str, Any]:
             - timestamp (str/int): Current timestamp
             - price (float): Current market price
             - Additional indicator data (RSI, MACD, moving averages, etc.)
-    
+            - include_message (bool, optional): Build the human-readable
+              message (default True); when False, message is ""
+
     Returns:
-        dict: A dictionary containing the trade decision with keys:
+        SignalResult: The trade decision with fields:
             - status (str): 'long', 'short', or 'no_trade'
             - reason (str): Explanation for the decision
             - entry (float|None): Suggested entry price
@@ -38,601 +166,712 @@ def evaluate_signal(data: Dict[str, Any]) -> Dict[str, Any]:
             - timeframe (str): Chart timeframe
             - timestamp (str/int): Timestamp of the signal
     """
-    
+
+    # Identifying fields echoed back in every response
+    instrument = data.get("instrument")
+    timeframe = data.get("timeframe")
+    timestamp = data.get("timestamp")
+
     # ============================================================================
     # MODULE 1: DATA VALIDATION
     # ============================================================================
-    
-    # Define all required fields for signal evaluation
-    required_fields = [
-        "instrument",      # Trading symbol (e.g., "EURUSD", "BTCUSD")
-        "timeframe",       # Chart timeframe (must be "4H")
-        "close",           # Current closing price
-        "high",            # Current/recent high price
-        "low",             # Current/recent low price
-        "rsi_4h",          # RSI indicator on 4H timeframe
-        "rsi_daily",       # RSI indicator on daily timeframe
-        "atr",             # Average True Range for volatility
-        "ema50_daily"      # 50-period EMA on daily timeframe
-    ]
-    
+
     # Check if all required fields are present in the input data
-    missing_fields = []
-    for field in required_fields:
-        if field not in data:
-            missing_fields.append(field)
-    
+    # (one C-level set difference; ordered by _REQUIRED_FIELDS for the message)
+    missing = _REQUIRED_FIELD_SET.difference(data)
+
     # If any required field is missing, return early with error status
-    if missing_fields:
-        return {
-            "status": "no_trade",
-            "reason": "data_invalid",
-            "entry": None,
-            "stop_loss": None,
-            "take_profit": None,
-            "rrr": None,
-            "confidence": 0,
-            "message": f"Missing required fields: {', '.join(missing_fields)}",
-            "instrument": data.get("instrument"),
-            "timeframe": data.get("timeframe"),
-            "timestamp": data.get("timestamp")
-        }
-    
-    # Check if any required field has a None value
-    none_fields = []
-    for field in required_fields:
-        if data[field] is None:
-            none_fields.append(field)
-    
+    if missing:
+        missing_fields = [field for field in _REQUIRED_FIELDS if field in missing]
+        return _no_trade(
+            instrument, timeframe, timestamp,
+            "data_invalid",
+            f"Missing required fields: {', '.join(missing_fields)}",
+        )
+
+    # Read every required field exactly once; the values double as locals for
+    # the rest of the evaluation
+    values = [data[field] for field in _REQUIRED_FIELDS]
+
     # If any required field is None, return early with error status
-    if none_fields:
-        return {
-            "status": "no_trade",
-            "reason": "data_invalid",
-            "entry": None,
-            "stop_loss": None,
-            "take_profit": None,
-            "rrr": None,
-            "confidence": 0,
-            "message": f"Fields with None values: {', '.join(none_fields)}",
-            "instrument": data.get("instrument"),
-            "timeframe": data.get("timeframe"),
-            "timestamp": data.get("timestamp")
-        }
-    
+    if None in values:
+        none_fields = [field for field, value in zip(_REQUIRED_FIELDS, values) if value is None]
+        return _no_trade(
+            instrument, timeframe, timestamp,
+            "data_invalid",
+            f"Fields with None values: {', '.join(none_fields)}",
+        )
+
     # Validate that the timeframe is specifically "4H"
     # This strategy is designed exclusively for 4-hour charts
-    if data["timeframe"] != "4H":
-        return {
-            "status": "no_trade",
-            "reason": "preconditions_not_met",
-            "entry": None,
-            "stop_loss": None,
-            "take_profit": None,
-            "rrr": None,
-            "confidence": 0,
-            "message": f"Invalid timeframe '{data['timeframe']}'. Strategy requires '4H' timeframe.",
-            "instrument": data.get("instrument"),
-            "timeframe": data.get("timeframe"),
-            "timestamp": data.get("timestamp")
-        }
-    
+    if timeframe != "4H":
+        return _no_trade(
+            instrument, timeframe, timestamp,
+            "preconditions_not_met",
+            f"Invalid timeframe '{timeframe}'. Strategy requires '4H' timeframe.",
+        )
+
     # All validation checks passed - data is valid and ready for analysis
-    
-    
+    _, _, close, high, low, rsi_4h, rsi_daily, atr, ema50_daily = values
+
     # ============================================================================
-    # MODULE 2: TREND FILTER
+    # MODULES 2-7: NUMERIC CORE
     # ============================================================================
-    
-    # Determine market trend by comparing current price to the daily 50 EMA
-    # The 50 EMA on the daily timeframe acts as a dynamic support/resistance
-    # and helps identify the overall market direction
-    
-    # Extract values for trend analysis
-    close = data["close"]
-    ema50_daily = data["ema50_daily"]
-    
-    # Compare current close price to the daily 50 EMA
-    if close > ema50_daily:
-        # Price is above the daily 50 EMA - uptrend
-        trend = "bullish"
-    else:
-        # Price is below the daily 50 EMA - downtrend
-        trend = "bearish"
-    
-    # The trend variable will be used to:
-    # 1. Filter signals to align with the overall market direction (trend-following)
-    # 2. Identify potential counter-trend reversal opportunities (with strong confluences)
-    # 3. Determine the direction of trade entries (long in bullish, short in bearish)
-    # 4. Adjust confidence scores based on trend alignment
-    
-    
+
+    # Trend, confluences, SL/TP/RRR, confidence and the final risk check run
+    # in the compiled kernel; only plain numbers are passed across
+
+    # Optional fields: one membership test + subscript each, defaults filled
+    # in from _OPTIONAL_DEFAULTS, unpacked straight into locals
+    opts = {**_OPTIONAL_DEFAULTS, **{k: data[k] for k in _OPTIONAL_DEFAULTS if k in data}}
+    candle_type = opts["candle_type"]
+    pattern = opts["pattern"]
+    divergence = bool(opts["divergence"])
+    strict_mode = bool(opts["strict_mode"])
+    recent_swing_low = opts["recent_swing_low"]
+    recent_swing_high = opts["recent_swing_high"]
+    include_message = opts["include_message"]
+
+    # Candle/pattern may arrive as names or as codes already encoded by the
+    # API layer (see encode_pattern)
+    candle_code = encode_pattern(candle_type, CANDLE_CODES)
+    pattern_code = encode_pattern(pattern, PATTERN_CODES)
+
+    # Strict and normal mode each have their own kernel with the RSI
+    # thresholds compiled in; pick one here instead of testing per bar
+    core = _scalar_core_strict if strict_mode else _scalar_core_normal
+
+    (reason_code, entry_price, stop_loss, take_profit, rrr, confidence_score,
+     flags, confluence_count, trend_score, candle_score) = core(
+        float(close),
+        float(high),
+        float(low),
+        float(rsi_4h),
+        float(rsi_daily),
+        float(atr),
+        float(ema50_daily),
+        math.nan if recent_swing_low is None else float(recent_swing_low),
+        math.nan if recent_swing_high is None else float(recent_swing_high),
+        candle_code,
+        pattern_code,
+        divergence,
+    )
+
+    return _build_result(
+        instrument, timeframe, timestamp,
+        reason_code, entry_price, stop_loss, take_profit, rrr, confidence_score,
+        flags, confluence_count, trend_score, candle_score,
+        strict_mode, divergence, rsi_4h, rsi_daily, candle_code, pattern_code,
+        include_message,
+    )
+
+
+def evaluate_signal_batch(arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Evaluate many bars at once using elementwise NumPy operations.
+
+    Every rule of evaluate_signal (trend filter, confluences, SL/TP, RRR,
+    confidence and final risk checks) is expressed as a vector operation over
+    parallel arrays, so a backtest over N bars costs a handful of NumPy passes
+    instead of N Python-level evaluations. Inputs are assumed to be validated
+    4H data; use evaluate_signal for per-request validation and messages.
+
+    Args:
+        arrays (dict): Parallel arrays (or sequences) of equal length N:
+            - close, high, low, rsi_4h, rsi_daily, atr, ema50_daily (required)
+            - candle_type, pattern (optional): integer codes from CANDLE_CODES /
+              PATTERN_CODES, or pattern names which are encoded on the fly
+            - divergence, strict_mode (optional): booleans or a single bool
+            - recent_swing_low, recent_swing_high (optional): NaN/None if unknown
+
+    Returns:
+        dict: Structure-of-arrays result, each array of length N:
+            - signal (int8): 1 long, -1 short, 0 no trade
+            - reason (int8): index into REASONS
+            - entry, stop_loss, take_profit, rrr (float64): NaN when no trade
+            - confidence (float64): 0 when not enough confluences
+            - confluence_count, trend_score, candle_score (int8)
+            - candle_code, pattern_code (int8): the encoded patterns
+            - bullish, rsi_ok, candle_ok, pattern_match,
+              pattern_ok, trend_ok (bool)
+    """
+
+    close = np.asarray(arrays["close"], dtype=np.float64)
+    n = close.shape[0]
+    rsi_4h = np.asarray(arrays["rsi_4h"], dtype=np.float64)
+    rsi_daily = np.asarray(arrays["rsi_daily"], dtype=np.float64)
+    atr = np.asarray(arrays["atr"], dtype=np.float64)
+    ema50_daily = np.asarray(arrays["ema50_daily"], dtype=np.float64)
+
+    candle_code = _encode_codes(arrays.get("candle_type"), CANDLE_CODES, n)
+    pattern_code = _encode_codes(arrays.get("pattern"), PATTERN_CODES, n)
+    divergence = _broadcast(arrays.get("divergence", False), bool, n)
+    strict_mode = _broadcast(arrays.get("strict_mode", False), bool, n)
+    swing_low = _broadcast(arrays.get("recent_swing_low", np.nan), np.float64, n)
+    swing_high = _broadcast(arrays.get("recent_swing_high", np.nan), np.float64, n)
+
+
     # ============================================================================
-    # MODULE 3: CONFLUENCE ANALYSIS
+    # MODULE 2: TREND FILTER
     # ============================================================================
-    
-    # Initialize confluence tracking
-    confluence_count = 0
-    confluence_details = []
-    
-    # Determine if we're in strict mode for RSI (using optional parameter)
-    strict_mode = data.get("strict_mode", False)
-    
-    # -------------------------------------------------------------------------
-    # CONFLUENCE 1: RSI EXTREME AT STRUCTURE
-    # -------------------------------------------------------------------------
-    # Check for RSI at extreme oversold/overbought levels
-    # These extreme levels suggest potential reversal points
-    
-    rsi_4h = data["rsi_4h"]
-    rsi_confluence_met = False
-    
-    if trend == "bullish":
-        # For long entries: look for oversold conditions
-        if strict_mode:
-            # Strict mode: RSI must be extremely oversold (<=5)
-            if rsi_4h <= 5:
-                rsi_confluence_met = True
-                confluence_details.append(f"RSI 4H extremely oversold: {rsi_4h:.2f}")
-        else:
-            # Normal mode: RSI oversold (<=20)
-            if rsi_4h <= 20:
-                rsi_confluence_met = True
-                confluence_details.append(f"RSI 4H oversold: {rsi_4h:.2f}")
-    
-    elif trend == "bearish":
-        # For short entries: look for overbought conditions
-        if strict_mode:
-            # Strict mode: RSI must be extremely overbought (>=95)
-            if rsi_4h >= 95:
-                rsi_confluence_met = True
-                confluence_details.append(f"RSI 4H extremely overbought: {rsi_4h:.2f}")
-        else:
-            # Normal mode: RSI overbought (>=80)
-            if rsi_4h >= 80:
-                rsi_confluence_met = True
-                confluence_details.append(f"RSI 4H overbought: {rsi_4h:.2f}")
-    
-    if rsi_confluence_met:
-        confluence_count += 1
-    
-    # -------------------------------------------------------------------------
-    # CONFLUENCE 2: CANDLE CONFIRMATION (OPTIONAL)
-    # -------------------------------------------------------------------------
-    # Check for specific candlestick patterns that support the trade direction
-    # Examples: hammer, shooting star, engulfing, doji, etc.
-    
-    candle_confluence_met = False
-    candle_type = data.get("candle_type", None)
-    
-    if candle_type:
-        # List of bullish candle patterns
-        bullish_candles = ["hammer", "bullish_engulfing", "morning_star", "bullish_pin_bar"]
-        # List of bearish candle patterns
-        bearish_candles = ["shooting_star", "bearish_engulfing", "evening_star", "bearish_pin_bar"]
-        
-        if trend == "bullish" and candle_type.lower() in bullish_candles:
-            candle_confluence_met = True
-            confluence_details.append(f"Bullish candle pattern: {candle_type}")
-            confluence_count += 1
-        elif trend == "bearish" and candle_type.lower() in bearish_candles:
-            candle_confluence_met = True
-            confluence_details.append(f"Bearish candle pattern: {candle_type}")
-            confluence_count += 1
-    
-    # -------------------------------------------------------------------------
-    # CONFLUENCE 3: PATTERN OR DIVERGENCE
-    # -------------------------------------------------------------------------
-    # Check for chart patterns or RSI/price divergence
-    # Patterns: double top/bottom, head and shoulders, triangles, etc.
-    # Divergence: price makes new high/low but RSI doesn't (or vice versa)
-    
-    pattern_confluence_met = False
-    
-    # Check for pattern string
-    pattern = data.get("pattern", None)
-    if pattern:
-        # List of bullish patterns
-        bullish_patterns = ["double_bottom", "inverse_head_shoulders", "ascending_triangle", 
-                           "bullish_flag", "cup_and_handle"]
-        # List of bearish patterns
-        bearish_patterns = ["double_top", "head_shoulders", "descending_triangle", 
-                           "bearish_flag", "rising_wedge"]
-        
-        if trend == "bullish" and pattern.lower() in bullish_patterns:
-            pattern_confluence_met = True
-            confluence_details.append(f"Bullish pattern: {pattern}")
-        elif trend == "bearish" and pattern.lower() in bearish_patterns:
-            pattern_confluence_met = True
-            confluence_details.append(f"Bearish pattern: {pattern}")
-    
-    # Check for divergence
-    divergence = data.get("divergence", False)
-    if divergence:
-        pattern_confluence_met = True
-        confluence_details.append("Price/RSI divergence detected")
-    
-    if pattern_confluence_met:
-        confluence_count += 1
-    
-    # -------------------------------------------------------------------------
-    # CONFLUENCE 4: TREND ALIGNMENT (DAILY TREND)
-    # -------------------------------------------------------------------------
-    # Check if the potential trade aligns with the daily trend
-    # Trend-aligned trades generally have higher probability of success
-    
-    rsi_daily = data["rsi_daily"]
-    trend_confluence_met = False
-    
-    if trend == "bullish":
-        # For bullish trend: daily RSI should not be overbought
-        # This ensures we're not buying at the top of a rally
-        if rsi_daily < 70:
-            trend_confluence_met = True
-            confluence_details.append(f"Daily trend aligned (RSI Daily: {rsi_daily:.2f})")
-    
-    elif trend == "bearish":
-        # For bearish trend: daily RSI should not be oversold
-        # This ensures we're not selling at the bottom of a decline
-        if rsi_daily > 30:
-            trend_confluence_met = True
-            confluence_details.append(f"Daily trend aligned (RSI Daily: {rsi_daily:.2f})")
-    
-    if trend_confluence_met:
-        confluence_count += 1
-    
-    # -------------------------------------------------------------------------
-    # CONFLUENCE REQUIREMENT CHECK
-    # -------------------------------------------------------------------------
-    # Minimum requirement: at least 3 out of 4 confluences must be met
-    # This ensures high-probability setups with multiple confirmations
-    
-    if confluence_count < 3:
-        return {
-            "status": "no_trade",
-            "reason": "not_enough_confluences",
-            "entry": None,
-            "stop_loss": None,
-            "take_profit": None,
-            "rrr": None,
-            "confidence": 0,
-            "message": f"Only {confluence_count}/4 confluences met. Need at least 3. Met: {'; '.join(confluence_details) if confluence_details else 'None'}",
-            "instrument": data.get("instrument"),
-            "timeframe": data.get("timeframe"),
-            "timestamp": data.get("timestamp")
-        }
-    
-    # Confluences are sufficient - proceed to signal generation
-    
-    
+
+    # Price above the daily 50 EMA = uptrend, otherwise downtrend
+    bullish = close > ema50_daily
+
+
     # ============================================================================
-    # MODULE 4: ENTRY SIGNAL GENERATION
+    # MODULE 3: CONFLUENCE ANALYSIS
     # ============================================================================
-    
-    # Determine trade direction based on trend and confluences
-    # Since we have sufficient confluences, we can generate an entry signal
-    
-    if trend == "bullish":
-        signal_direction = "long"
-    elif trend == "bearish":
-        signal_direction = "short"
-    
-    # Set entry price to current close price
-    entry_price = data["close"]
-    
-    
+
+    # CONFLUENCE 1: RSI extreme (strict mode uses 5/95 instead of 20/80)
+    rsi_ok = np.where(
+        bullish,
+        rsi_4h <= np.where(strict_mode, RSI_OVERSOLD_STRICT, RSI_OVERSOLD),
+        rsi_4h >= np.where(strict_mode, RSI_OVERBOUGHT_STRICT, RSI_OVERBOUGHT),
+    )
+
+    # CONFLUENCE 2: Candle confirmation in the trend direction
+    candle_ok = np.where(
+        bullish,
+        np.isin(candle_code, BULLISH_CANDLE_CODES),
+        np.isin(candle_code, BEARISH_CANDLE_CODES),
+    )
+
+    # CONFLUENCE 3: Chart pattern in the trend direction, or divergence
+    pattern_match = np.where(
+        bullish,
+        np.isin(pattern_code, BULLISH_PATTERN_CODES),
+        np.isin(pattern_code, BEARISH_PATTERN_CODES),
+    )
+    pattern_ok = pattern_match | divergence
+
+    # CONFLUENCE 4: Daily RSI not stretched against the trend
+    trend_ok = np.where(bullish, rsi_daily < 70, rsi_daily > 30)
+
+    confluence_count = (
+        rsi_ok.astype(np.int8)
+        + candle_ok.astype(np.int8)
+        + pattern_ok.astype(np.int8)
+        + trend_ok.astype(np.int8)
+    )
+
+    # At least 3 out of 4 confluences must be met
+    enough_confluences = confluence_count >= 3
+
+
     # ============================================================================
-    # MODULE 5: STOP LOSS & TAKE PROFIT CALCULATION
+    # MODULES 4-5: ENTRY, STOP LOSS & TAKE PROFIT
     # ============================================================================
-    
-    # Extract ATR for volatility-based stop loss calculation
-    atr = data["atr"]
-    
-    # -------------------------------------------------------------------------
-    # STOP LOSS CALCULATION
-    # -------------------------------------------------------------------------
-    # Stop loss is determined by the larger of:
-    # 1. 1.0 × ATR (volatility-based stop)
-    # 2. Distance to recent swing high/low (structure-based stop)
-    #
-    # ATR-based stops adapt to market volatility
-    # Structure-based stops respect key support/resistance levels
-    
-    # Start with ATR-based stop loss distance
-    sl_distance = 1.0 * atr
-    
-    # Check if swing levels are provided for structure-based stops
-    recent_swing_low = data.get("recent_swing_low", None)
-    recent_swing_high = data.get("recent_swing_high", None)
-    
-    if signal_direction == "long" and recent_swing_low is not None:
-        # For long trades: stop below recent swing low
-        # Calculate distance from entry to swing low
-        structure_sl_distance = entry_price - recent_swing_low
-        
-        # Use the larger of ATR-based or structure-based distance
-        # This ensures we're beyond the swing low for better protection
-        if structure_sl_distance > sl_distance:
-            sl_distance = structure_sl_distance
-    
-    elif signal_direction == "short" and recent_swing_high is not None:
-        # For short trades: stop above recent swing high
-        # Calculate distance from entry to swing high
-        structure_sl_distance = recent_swing_high - entry_price
-        
-        # Use the larger of ATR-based or structure-based distance
-        # This ensures we're beyond the swing high for better protection
-        if structure_sl_distance > sl_distance:
-            sl_distance = structure_sl_distance
-    
-    # -------------------------------------------------------------------------
-    # TAKE PROFIT CALCULATION
-    # -------------------------------------------------------------------------
-    # Take profit is set at minimum 2:1 risk-reward ratio
-    # TP distance = 2 × SL distance
-    # This ensures we're risking $1 to make at least $2
-    
+
+    # +1.0 for long (bullish), -1.0 for short (bearish); kept as float64 so
+    # the SL/TP expressions below run without int -> float conversions
+    direction = np.where(bullish, 1.0, -1.0)
+    entry_price = close
+
+    # Stop distance is the larger of 1.0 x ATR and the distance to the recent
+    # swing low (long) / swing high (short), as one signed expression and one
+    # fmax (maxpd). fmax ignores NaN, so a missing swing level falls back to
+    # the ATR-based stop.
+    swing_level = np.where(bullish, swing_low, swing_high)
+    sl_distance = np.fmax(atr, direction * (entry_price - swing_level))
+
+    # Take profit at a 2:1 risk-reward ratio
     tp_distance = 2.0 * sl_distance
-    
-    # -------------------------------------------------------------------------
-    # CALCULATE ACTUAL PRICE LEVELS
-    # -------------------------------------------------------------------------
-    # Apply the calculated distances to entry price based on trade direction
-    
-    if signal_direction == "long":
-        # Long trade: SL below entry, TP above entry
-        stop_loss = entry_price - sl_distance
-        take_profit = entry_price + tp_distance
-    
-    elif signal_direction == "short":
-        # Short trade: SL above entry, TP below entry
-        stop_loss = entry_price + sl_distance
-        take_profit = entry_price - tp_distance
-    
-    # -------------------------------------------------------------------------
-    # RISK-REWARD RATIO CALCULATION
-    # -------------------------------------------------------------------------
-    # RRR = Reward (TP distance) / Risk (SL distance)
-    # Minimum acceptable RRR is 2.0 (as enforced by TP calculation)
-    
-    rrr = tp_distance / sl_distance
-    
-    # -------------------------------------------------------------------------
-    # ROUND ALL PRICE LEVELS
-    # -------------------------------------------------------------------------
-    # Round to appropriate decimal places for clean output
-    # Most forex pairs use 5 decimals, stocks/crypto use 2-4
-    
-    entry_price = round(entry_price, 5)
-    stop_loss = round(stop_loss, 5)
-    take_profit = round(take_profit, 5)
-    rrr = round(rrr, 2)
-    
-    
+
+    stop_loss = entry_price - direction * sl_distance
+    take_profit = entry_price + direction * tp_distance
+
+    # A zero stop distance yields NaN here and is rejected by the final risk
+    # check (stop loss equal to entry)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rrr = tp_distance / sl_distance
+
+    # Round half up with the same arithmetic as the numeric core
+    entry_price = np.floor(entry_price * PRICE_SCALE + 0.5) / PRICE_SCALE
+    stop_loss = np.floor(stop_loss * PRICE_SCALE + 0.5) / PRICE_SCALE
+    take_profit = np.floor(take_profit * PRICE_SCALE + 0.5) / PRICE_SCALE
+    rrr = np.floor(rrr * RRR_SCALE + 0.5) / RRR_SCALE
+
+
     # ============================================================================
     # MODULE 6: CONFIDENCE SCORING
     # ============================================================================
-    
-    # Confidence score is calculated as a weighted sum of multiple factors
-    # Total: 100% = Confluences (25%) + Trend (20%) + Level (20%) + Candle (20%) + Market (15%)
-    # Minimum acceptable confidence: 70%
-    
-    confidence_score = 0
-    
-    # -------------------------------------------------------------------------
-    # COMPONENT 1: CONFLUENCES (25% weight)
-    # -------------------------------------------------------------------------
-    # Score based on number of confluences met (out of 4 possible)
-    # 3/4 confluences = 18.75%, 4/4 confluences = 25%
-    
-    confluence_percentage = (confluence_count / 4) * 25
-    confidence_score += confluence_percentage
-    
-    # -------------------------------------------------------------------------
-    # COMPONENT 2: TREND ALIGNMENT (20% weight)
-    # -------------------------------------------------------------------------
-    # Score based on how well the signal aligns with the daily trend
-    # - Full points if RSI daily is in healthy range (not extreme)
-    # - Partial points if RSI is getting extended
-    
-    trend_score = 0
-    
-    if trend == "bullish":
-        # For bullish trades: check daily RSI positioning
-        if rsi_daily < 50:
-            # Strong pullback in uptrend - excellent entry
-            trend_score = 20
-        elif rsi_daily < 60:
-            # Moderate pullback - good entry
-            trend_score = 15
-        elif rsi_daily < 70:
-            # Shallow pullback - acceptable entry
-            trend_score = 10
-        else:
-            # Overbought on daily - risky entry
-            trend_score = 5
-    
-    elif trend == "bearish":
-        # For bearish trades: check daily RSI positioning
-        if rsi_daily > 50:
-            # Strong rally in downtrend - excellent entry
-            trend_score = 20
-        elif rsi_daily > 40:
-            # Moderate rally - good entry
-            trend_score = 15
-        elif rsi_daily > 30:
-            # Shallow rally - acceptable entry
-            trend_score = 10
-        else:
-            # Oversold on daily - risky entry
-            trend_score = 5
-    
-    confidence_score += trend_score
-    
-    # -------------------------------------------------------------------------
-    # COMPONENT 3: LEVEL QUALITY (20% weight)
-    # -------------------------------------------------------------------------
-    # Score based on proximity to key support/resistance levels
-    # For now, using simplified default score of 20%
-    # Future enhancement: calculate based on distance to S/R levels
-    
-    level_quality_score = 20  # Default: assume good level quality
-    confidence_score += level_quality_score
-    
-    # -------------------------------------------------------------------------
-    # COMPONENT 4: CANDLE CONFIRMATION QUALITY (20% weight)
-    # -------------------------------------------------------------------------
-    # Score based on strength of candlestick pattern
-    # - Full points if strong reversal pattern present
-    # - Partial points if pattern exists but weaker
-    # - Reduced points if no candle confirmation
-    
-    candle_score = 0
-    
-    if candle_confluence_met:
-        # Strong candle patterns get full points
-        strong_patterns = ["hammer", "shooting_star", "bullish_engulfing", 
-                          "bearish_engulfing", "morning_star", "evening_star"]
-        if candle_type and candle_type.lower() in strong_patterns:
-            candle_score = 20
-        else:
-            # Weaker patterns get partial points
-            candle_score = 12
-    else:
-        # No candle confirmation: reduced score but not zero
-        # (Other confluences may still be strong)
-        candle_score = 8
-    
-    confidence_score += candle_score
-    
-    # -------------------------------------------------------------------------
-    # COMPONENT 5: MARKET CONDITIONS (15% weight)
-    # -------------------------------------------------------------------------
-    # Score based on overall market environment and volatility
-    # For now, using simplified default score of 15%
-    # Future enhancement: factor in volume, volatility regime, session times
-    
-    market_conditions_score = 15  # Default: assume neutral market conditions
-    confidence_score += market_conditions_score
-    
-    # -------------------------------------------------------------------------
-    # CONFIDENCE THRESHOLD CHECK
-    # -------------------------------------------------------------------------
+
+    # Confluences (25%) + Trend (20%) + Level (20%) + Candle (20%) + Market (15%)
+
+    # Table lookups: one searchsorted per trend direction, then a gather
+    trend_score = np.where(
+        bullish,
+        BULL_TREND_SCORES[np.searchsorted(BULL_TREND_THRESHOLDS, rsi_daily, side="right")],
+        BEAR_TREND_SCORES[np.searchsorted(BEAR_TREND_THRESHOLDS, rsi_daily, side="left")],
+    )
+
+    candle_score = np.where(
+        candle_ok,
+        CANDLE_SCORES.take(candle_code, mode="clip"),
+        NO_CANDLE_SCORE,
+    ).astype(np.int8)
+
+    # Integer arithmetic in tenths of a percent (see the numeric core)
+    confidence_tenths = (confluence_count.astype(np.int32) * 250 + 2) // 4 + 10 * (
+        trend_score.astype(np.int32) + LEVEL_QUALITY_SCORE + candle_score + MARKET_CONDITIONS_SCORE
+    )
+    confidence_score = confidence_tenths / 10
+
     # Minimum confidence requirement: 70%
-    # Below this threshold, signal quality is too low for trade execution
-    
-    confidence_score = round(confidence_score, 1)
-    
-    if confidence_score < 70:
-        return {
-            "status": "no_trade",
-            "reason": "confidence_too_low",
-            "entry": None,
-            "stop_loss": None,
-            "take_profit": None,
-            "rrr": None,
-            "confidence": confidence_score,
-            "message": f"Confidence score {confidence_score}% is below minimum threshold of 70%. "
-                      f"Confluences: {confluence_percentage:.1f}%, Trend: {trend_score}, "
-                      f"Level: {level_quality_score}, Candle: {candle_score}, Market: {market_conditions_score}",
-            "instrument": data.get("instrument"),
-            "timeframe": data.get("timeframe"),
-            "timestamp": data.get("timestamp")
-        }
-    
-    # Confidence threshold met - proceed to final decision
-    
-    
+    confident = confidence_score >= 70
+
+
     # ============================================================================
     # MODULE 7: FINAL DECISION & RISK CHECKS
     # ============================================================================
-    
-    # All validation checks have passed:
-    # ✓ Data is valid and complete
-    # ✓ Sufficient confluences (≥3/4)
-    # ✓ Stop loss and take profit calculated
-    # ✓ Confidence score meets threshold (≥70%)
-    
+
+    # Stop loss and take profit must be on the correct side of entry
+    valid_risk = np.where(
+        bullish,
+        (stop_loss < entry_price) & (take_profit > entry_price),
+        (stop_loss > entry_price) & (take_profit < entry_price),
+    )
+
+    reason = np.select(
+        [~enough_confluences, ~confident, ~valid_risk],
+        [REASON_NOT_ENOUGH_CONFLUENCES, REASON_CONFIDENCE_TOO_LOW, REASON_INVALID_RISK_PARAMETERS],
+        REASON_ALL_CONDITIONS_MET,
+    ).astype(np.int8)
+
+    trade = reason == REASON_ALL_CONDITIONS_MET
+
+    return {
+        "signal": np.where(trade, direction, 0).astype(np.int8),
+        "reason": reason,
+        "entry": np.where(trade, entry_price, np.nan),
+        "stop_loss": np.where(trade, stop_loss, np.nan),
+        "take_profit": np.where(trade, take_profit, np.nan),
+        "rrr": np.where(trade, rrr, np.nan),
+        "confidence": np.where(enough_confluences, confidence_score, 0.0),
+        "confluence_count": confluence_count,
+        "trend_score": trend_score,
+        "candle_score": candle_score,
+        "candle_code": candle_code,
+        "pattern_code": pattern_code,
+        "bullish": bullish,
+        "rsi_ok": rsi_ok,
+        "candle_ok": candle_ok,
+        "pattern_match": pattern_match,
+        "pattern_ok": pattern_ok,
+        "trend_ok": trend_ok,
+    }
+
+
+def evaluate_signals_batch(arrays: Dict[str, Any]) -> List[SignalResult]:
+    """
+    Evaluate many bars in one vectorized pass and return one SignalResult
+    per bar, with the same decisions and messages as evaluate_signal.
+
+    The decision logic runs once over all bars in evaluate_signal_batch
+    (NumPy masks instead of per-row branches); only the final result
+    objects and messages are built per row. Required fields must already be
+    present and non-null (e.g. validated by the API models); a timeframe
+    other than "4H" is reported per row as preconditions_not_met.
+
+    Args:
+        arrays (dict): Parallel columns of equal length N with the same keys
+            as an evaluate_signal payload. instrument, timeframe, timestamp
+            and the optional fields may also be single values shared by
+            every bar.
+
+    Returns:
+        List[SignalResult]: One result per bar, in input order
+    """
+    n = len(arrays["close"])
+    out = evaluate_signal_batch(arrays)
+
+    # Same flag bitmask the numeric core reports for a single bar
+    flags = (
+        out["bullish"] * FLAG_BULLISH
+        | out["rsi_ok"] * FLAG_RSI
+        | out["candle_ok"] * FLAG_CANDLE
+        | out["pattern_match"] * FLAG_PATTERN
+        | out["trend_ok"] * FLAG_TREND
+    )
+
+    # Columns converted to Python lists once, then walked row by row
+    rows = zip(
+        _as_list(arrays.get("instrument"), n),
+        _as_list(arrays.get("timeframe"), n),
+        _as_list(arrays.get("timestamp"), n),
+        out["reason"].tolist(),
+        out["entry"].tolist(),
+        out["stop_loss"].tolist(),
+        out["take_profit"].tolist(),
+        out["rrr"].tolist(),
+        out["confidence"].tolist(),
+        flags.tolist(),
+        out["confluence_count"].tolist(),
+        out["trend_score"].tolist(),
+        out["candle_score"].tolist(),
+        _broadcast(arrays.get("strict_mode", False), bool, n).tolist(),
+        _broadcast(arrays.get("divergence", False), bool, n).tolist(),
+        _as_list(arrays["rsi_4h"], n),
+        _as_list(arrays["rsi_daily"], n),
+        out["candle_code"].tolist(),
+        out["pattern_code"].tolist(),
+        _as_list(arrays.get("include_message", True), n),
+    )
+
+    results = []
+    for row in rows:
+        timeframe = row[1]
+        if timeframe != "4H":
+            results.append(_no_trade(
+                row[0], timeframe, row[2],
+                "preconditions_not_met",
+                f"Invalid timeframe '{timeframe}'. Strategy requires '4H' timeframe.",
+            ))
+        else:
+            results.append(_build_result(*row))
+
+    return results
+
+
+# Numba's fallback (workqueue) threading layer must not be entered from two
+# threads at once, so parallel backtests are serialized; each one already
+# uses every core
+_BACKTEST_LOCK = threading.Lock()
+
+
+def backtest_signals(arrays: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Evaluate a bar series with the parallel Numba kernel.
+
+    Same inputs as evaluate_signal_batch, but every bar runs through the
+    compiled numeric core (_evaluate_core) in one prange loop split across
+    CPU cores, instead of a sequence of whole-array NumPy passes. Inputs
+    are assumed to be validated 4H data.
+
+    Args:
+        arrays (dict): Parallel arrays (or sequences) of equal length N, as
+            for evaluate_signal_batch
+
+    Returns:
+        dict: Structure-of-arrays result, each array of length N:
+            - signal (int8): 1 long, -1 short, 0 no trade
+            - reason (int8): index into REASONS
+            - entry, stop_loss, take_profit, rrr (float64): NaN when no trade
+            - confidence (float64): 0 when not enough confluences
+            - flags (int8): FLAG_* bitmask of trend and met confluences
+            - confluence_count, trend_score, candle_score (int8); the scores
+              are 0 when there are not enough confluences
+    """
+    close = np.ascontiguousarray(arrays["close"], dtype=np.float64)
+    n = close.shape[0]
+
+    def column(name: str, default: Any, dtype: Any) -> np.ndarray:
+        return np.ascontiguousarray(_broadcast(arrays.get(name, default), dtype, n))
+
+    with _BACKTEST_LOCK:
+        (reason, entry, stop_loss, take_profit, rrr, confidence, flags,
+         confluence_count, trend_score, candle_score) = _backtest_core(
+            close,
+            column("high", np.nan, np.float64),
+            column("low", np.nan, np.float64),
+            column("rsi_4h", np.nan, np.float64),
+            column("rsi_daily", np.nan, np.float64),
+            column("atr", np.nan, np.float64),
+            column("ema50_daily", np.nan, np.float64),
+            column("recent_swing_low", np.nan, np.float64),
+            column("recent_swing_high", np.nan, np.float64),
+            np.ascontiguousarray(_encode_codes(arrays.get("candle_type"), CANDLE_CODES, n)),
+            np.ascontiguousarray(_encode_codes(arrays.get("pattern"), PATTERN_CODES, n)),
+            column("divergence", False, bool),
+            column("strict_mode", False, bool),
+        )
+
+    direction = np.where(flags & FLAG_BULLISH, 1, -1).astype(np.int8)
+
+    return {
+        "signal": np.where(reason == REASON_ALL_CONDITIONS_MET, direction, 0).astype(np.int8),
+        "reason": reason,
+        "entry": entry,
+        "stop_loss": stop_loss,
+        "take_profit": take_profit,
+        "rrr": rrr,
+        "confidence": confidence,
+        "flags": flags,
+        "confluence_count": confluence_count,
+        "trend_score": trend_score,
+        "candle_score": candle_score,
+    }
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _build_result(
+    instrument: Any,
+    timeframe: Any,
+    timestamp: Any,
+    reason_code: int,
+    entry_price: float,
+    stop_loss: float,
+    take_profit: float,
+    rrr: float,
+    confidence_score: float,
+    flags: int,
+    confluence_count: int,
+    trend_score: int,
+    candle_score: int,
+    strict_mode: bool,
+    divergence: bool,
+    rsi_4h: float,
+    rsi_daily: float,
+    candle_code: int,
+    pattern_code: int,
+    include_message: Any,
+) -> SignalResult:
+    """
+    Turn the numeric core's outputs for one bar into a SignalResult,
+    including the optional human-readable message. Shared by
+    evaluate_signal and evaluate_signals_batch.
+    """
+
+    trend = "bullish" if flags & FLAG_BULLISH else "bearish"
+
+    # -------------------------------------------------------------------------
+    # CONFLUENCE DETAILS
     # -------------------------------------------------------------------------
-    # FINAL RISK VALIDATION
+    # Human-readable messages are optional: bulk callers that only read
+    # status/confidence pass include_message=False and skip all formatting
+
+    if include_message:
+        confluence_details = _format_details(
+            flags, strict_mode, divergence, rsi_4h, rsi_daily, candle_code, pattern_code
+        )
+
     # -------------------------------------------------------------------------
-    # Perform final sanity checks on risk parameters
-    
-    # Ensure stop loss and take profit are on correct side of entry
-    if signal_direction == "long":
-        if stop_loss >= entry_price or take_profit <= entry_price:
-            return {
-                "status": "no_trade",
-                "reason": "invalid_risk_parameters",
-                "entry": None,
-                "stop_loss": None,
-                "take_profit": None,
-                "rrr": None,
-                "confidence": confidence_score,
-                "message": "Invalid SL/TP positioning for long trade",
-                "instrument": data.get("instrument"),
-                "timeframe": data.get("timeframe"),
-                "timestamp": data.get("timestamp")
-            }
-    
-    elif signal_direction == "short":
-        if stop_loss <= entry_price or take_profit >= entry_price:
-            return {
-                "status": "no_trade",
-                "reason": "invalid_risk_parameters",
-                "entry": None,
-                "stop_loss": None,
-                "take_profit": None,
-                "rrr": None,
-                "confidence": confidence_score,
-                "message": "Invalid SL/TP positioning for short trade",
-                "instrument": data.get("instrument"),
-                "timeframe": data.get("timeframe"),
-                "timestamp": data.get("timestamp")
-            }
-    
+    # NO-TRADE DECISIONS
+    # -------------------------------------------------------------------------
+
+    if reason_code == REASON_NOT_ENOUGH_CONFLUENCES:
+        return _no_trade(
+            instrument, timeframe, timestamp,
+            "not_enough_confluences",
+            f"Only {confluence_count}/4 confluences met. Need at least 3. "
+            f"Met: {'; '.join(confluence_details) if confluence_details else 'None'}"
+            if include_message else "",
+        )
+
+    if reason_code == REASON_CONFIDENCE_TOO_LOW:
+        confluence_percentage = (confluence_count / 4) * 25
+        return _no_trade(
+            instrument, timeframe, timestamp,
+            "confidence_too_low",
+            f"Confidence score {confidence_score}% is below minimum threshold of 70%. "
+            f"Confluences: {confluence_percentage:.1f}%, Trend: {trend_score}, "
+            f"Level: {LEVEL_QUALITY_SCORE}, Candle: {candle_score}, "
+            f"Market: {MARKET_CONDITIONS_SCORE}"
+            if include_message else "",
+            confidence=confidence_score,
+        )
+
+    signal_direction = "long" if trend == "bullish" else "short"
+
+    if reason_code == REASON_INVALID_RISK_PARAMETERS:
+        return _no_trade(
+            instrument, timeframe, timestamp,
+            "invalid_risk_parameters",
+            f"Invalid SL/TP positioning for {signal_direction} trade"
+            if include_message else "",
+            confidence=confidence_score,
+        )
+
     # -------------------------------------------------------------------------
     # GENERATE FINAL MESSAGE
     # -------------------------------------------------------------------------
     # Create a comprehensive message summarizing the trade setup
-    
+
     # Build message with trend and confluence information
-    message_parts = [
-        f"Trend: {trend.upper()}",
-        f"Signal: {signal_direction.upper()}",
-        f"Confluences ({confluence_count}/4): {'; '.join(confluence_details)}"
-    ]
-    
-    final_message = " | ".join(message_parts)
-    
+    if include_message:
+        message_parts = [
+            f"Trend: {trend.upper()}",
+            f"Signal: {signal_direction.upper()}",
+            f"Confluences ({confluence_count}/4): {'; '.join(confluence_details)}"
+        ]
+
+        final_message = " | ".join(message_parts)
+    else:
+        final_message = ""
+
     # -------------------------------------------------------------------------
     # RETURN FINAL TRADE SIGNAL
     # -------------------------------------------------------------------------
     # All conditions met - return complete trade signal with all parameters
-    
-    return {
-        "status": signal_direction,           # "long" or "short"
-        "reason": "all_conditions_met",       # All checks passed
-        "entry": entry_price,                 # Entry price level
-        "stop_loss": stop_loss,               # Stop loss price level
-        "take_profit": take_profit,           # Take profit price level
-        "rrr": rrr,                           # Risk-to-reward ratio
-        "confidence": confidence_score,       # Confidence percentage (0-100)
-        "message": final_message,             # Summary of trade setup
-        "instrument": data.get("instrument"), # Trading instrument
-        "timeframe": data.get("timeframe"),   # Chart timeframe
-        "timestamp": data.get("timestamp")    # Signal timestamp
-    }
 
+    return SignalResult(
+        status=signal_direction,           # "long" or "short"
+        reason="all_conditions_met",       # All checks passed
+        entry=entry_price,                 # Entry price level
+        stop_loss=stop_loss,               # Stop loss price level
+        take_profit=take_profit,           # Take profit price level
+        rrr=rrr,                           # Risk-to-reward ratio
+        confidence=confidence_score,       # Confidence percentage (0-100)
+        message=final_message,             # Summary of trade setup
+        instrument=instrument,             # Trading instrument
+        timeframe=timeframe,               # Chart timeframe
+        timestamp=timestamp                # Signal timestamp
+    )
 
-# ============================================================================
-# HELPER FUNCTIONS
-# ============================================================================
-# TODO: Add helper functions for each module as needed
-# Example functions to implement:
-# - validate_data(data: dict) -> tuple[bool, str]
-# - calculate_trend(data: dict) -> str
-# - check_confluences(data: dict) -> dict
-# - calculate_stop_loss(entry: float, direction: str, atr: float) -> float
-# - calculate_take_profit(entry: float, stop_loss: float, rrr: float) -> float
-# - calculate_confidence(factors: dict) -> int
+
+def invalid_data_result(data: Dict[str, Any], message: str) -> SignalResult:
+    """
+    Build the data_invalid no-trade result for a bar, for callers that catch
+    a field error evaluate_signal raised on it (e.g. a non-numeric price).
+    """
+    return _no_trade(
+        data.get("instrument"), data.get("timeframe"), data.get("timestamp"),
+        "data_invalid", message,
+    )
+
+
+def _no_trade(
+    instrument: Any,
+    timeframe: Any,
+    timestamp: Any,
+    reason: str,
+    message: str,
+    confidence: float = 0.0,
+) -> SignalResult:
+    """
+    Build a no-trade result (no entry, stop loss, take profit or RRR).
+
+    confidence defaults to 0.0 (a float, as on trade results), so every
+    endpoint serializes the same shape.
+    """
+    return SignalResult(
+        "no_trade", reason, None, None, None, None,
+        confidence, message, instrument, timeframe, timestamp,
+    )
+
+
+def _format_details(
+    flags: int,
+    strict_mode: bool,
+    divergence: bool,
+    rsi_4h: float,
+    rsi_daily: float,
+    candle_code: int,
+    pattern_code: int,
+) -> List[str]:
+    """
+    Describe each confluence flagged by the numeric core, in evaluation order.
+    """
+    trend = "Bullish" if flags & FLAG_BULLISH else "Bearish"
+    details = []
+
+    if flags & FLAG_RSI:
+        if flags & FLAG_BULLISH:
+            if strict_mode:
+                details.append(f"RSI 4H extremely oversold: {rsi_4h:.2f}")
+            else:
+                details.append(f"RSI 4H oversold: {rsi_4h:.2f}")
+        else:
+            if strict_mode:
+                details.append(f"RSI 4H extremely overbought: {rsi_4h:.2f}")
+            else:
+                details.append(f"RSI 4H overbought: {rsi_4h:.2f}")
+
+    if flags & FLAG_CANDLE:
+        details.append(f"{trend} candle pattern: {CANDLE_NAMES[candle_code]}")
+
+    if flags & FLAG_PATTERN:
+        details.append(f"{trend} pattern: {PATTERN_NAMES[pattern_code]}")
+    if divergence:
+        details.append("Price/RSI divergence detected")
+
+    if flags & FLAG_TREND:
+        details.append(f"Daily trend aligned (RSI Daily: {rsi_daily:.2f})")
+
+    return details
+
+
+def encode_pattern(value: Any, codes: Dict[str, int]) -> int:
+    """
+    Encode a candle/chart pattern name as its integer code.
+
+    Names are matched case-insensitively against codes (CANDLE_CODES or
+    PATTERN_CODES); None, empty and unknown names map to 0. Values that are
+    already integer codes are returned unchanged if they are known codes
+    (1..len(codes)) and map to 0 otherwise, like unknown names. Anything
+    else (bools, floats, ...) is not a pattern and maps to 0.
+
+    Names are lowercased at most once, and only when the exact-case lookup
+    misses; canonical lowercase names skip the .lower() copy entirely.
+    """
+    if isinstance(value, str):
+        if not value:
+            return 0
+        code = codes.get(value)
+        if code is None:
+            code = codes.get(value.lower(), 0)
+        return code
+    # bool is an int subclass but never a pattern code
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return int(value) if 0 < value <= len(codes) else 0
+    return 0
+
+
+class _CodeLookup(dict):
+    """
+    Memoized name -> code mapping for one batch.
+
+    Each distinct raw value (as given, e.g. "Hammer" or None) is lowercased
+    and looked up in the code table only once; every later row is a single
+    hashed dict hit.
+    """
+
+    def __init__(self, codes: Dict[str, int]):
+        super().__init__()
+        self.codes = codes
+
+    def __missing__(self, name: Any) -> int:
+        code = self[name] = encode_pattern(name, self.codes)
+        return code
+
+
+def _encode_codes(values: Optional[Any], codes: Dict[str, int], n: int) -> np.ndarray:
+    """
+    Convert pattern names (or already-encoded codes) to an int8 code array.
+    Unknown names and codes, None and empty strings map to 0.
+    """
+    if values is None:
+        return np.zeros(n, dtype=np.int8)
+
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        # Unknown codes map to 0 instead of wrapping around in int8
+        known = (values > 0) & (values <= len(codes))
+        return np.broadcast_to(np.where(known, values, 0).astype(np.int8), (n,))
+
+    flat = values.ravel()
+    encoded = np.fromiter(map(_CodeLookup(codes).__getitem__, flat), dtype=np.int8, count=flat.size)
+    return np.broadcast_to(encoded, (n,))
+
+
+def _broadcast(values: Any, dtype: Any, n: int) -> np.ndarray:
+    """
+    Convert a scalar or sequence to an array of length n (None -> False/NaN).
+    """
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (n,))
+
+
+def _as_list(values: Any, n: int) -> List[Any]:
+    """
+    Convert a column (list, tuple or array) or a single shared value to a
+    list of length n.
+    """
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    if isinstance(values, (list, tuple)):
+        return list(values)
+    return [values] * n
@@ -0,0 +1,415 @@
+"""
+Numeric Signal Core
+
+This module holds the pure-numeric part of the signal evaluation (trend
+decision, confluence counting, SL/TP/RRR, confidence scoring and the final
+sanity check) compiled to native code with Numba.
+
+The kernel takes only floats, small ints and bools so it can be compiled
+ahead of the first request. Kernels release the GIL (nogil), so calls from
+worker threads run in parallel. If Numba is not installed, the same code
+runs as plain Python.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - Numba is optional
+    prange = range  # type: ignore[misc]
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        """
+        Fallback decorator used when Numba is unavailable: returns the
+        function unchanged, whether used as @njit or @njit(...).
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# ============================================================================
+# PATTERN CODES
+# ============================================================================
+# Candle and chart patterns are encoded as small integers so the kernels can
+# test membership without string comparisons.
+# Code 0 means "no pattern" (None, empty or unrecognised name); each table
+# uses the codes 1..len(table) without gaps, which encode_pattern relies on
+# to range-check codes that arrive already encoded.
+
+CANDLE_CODES = {
+    # Bullish candle patterns
+    "hammer": 1,
+    "bullish_engulfing": 2,
+    "morning_star": 3,
+    "bullish_pin_bar": 4,
+    # Bearish candle patterns
+    "shooting_star": 5,
+    "bearish_engulfing": 6,
+    "evening_star": 7,
+    "bearish_pin_bar": 8,
+}
+
+PATTERN_CODES = {
+    # Bullish chart patterns
+    "double_bottom": 1,
+    "inverse_head_shoulders": 2,
+    "ascending_triangle": 3,
+    "bullish_flag": 4,
+    "cup_and_handle": 5,
+    # Bearish chart patterns
+    "double_top": 6,
+    "head_shoulders": 7,
+    "descending_triangle": 8,
+    "bearish_flag": 9,
+    "rising_wedge": 10,
+}
+
+# Reverse maps (code -> canonical name) used to rebuild response messages
+CANDLE_NAMES = {code: name for name, code in CANDLE_CODES.items()}
+PATTERN_NAMES = {code: name for name, code in PATTERN_CODES.items()}
+
+BULLISH_CANDLE_CODES = np.array([1, 2, 3, 4], dtype=np.int8)
+BEARISH_CANDLE_CODES = np.array([5, 6, 7, 8], dtype=np.int8)
+
+BULLISH_PATTERN_CODES = np.array([1, 2, 3, 4, 5], dtype=np.int8)
+BEARISH_PATTERN_CODES = np.array([6, 7, 8, 9, 10], dtype=np.int8)
+
+
+# ============================================================================
+# REASON CODES & FLAGS
+# ============================================================================
+# The decision for each bar is reported as an int8 code; REASONS maps each
+# code back to the reason string used in the response.
+
+REASON_ALL_CONDITIONS_MET = 0
+REASON_NOT_ENOUGH_CONFLUENCES = 1
+REASON_CONFIDENCE_TOO_LOW = 2
+REASON_INVALID_RISK_PARAMETERS = 3
+
+REASONS = (
+    "all_conditions_met",
+    "not_enough_confluences",
+    "confidence_too_low",
+    "invalid_risk_parameters",
+)
+
+# Bit flags describing the trend and which confluences were met
+FLAG_BULLISH = 1
+FLAG_RSI = 2
+FLAG_CANDLE = 4
+FLAG_PATTERN = 8
+FLAG_TREND = 16
+
+# 4H RSI extremes: normal mode 20/80, strict mode 5/95
+RSI_OVERSOLD = 20.0
+RSI_OVERBOUGHT = 80.0
+RSI_OVERSOLD_STRICT = 5.0
+RSI_OVERBOUGHT_STRICT = 95.0
+
+# Output precision: prices to 5 decimals, RRR to 2 decimals
+PRICE_SCALE = 1e5
+RRR_SCALE = 1e2
+
+# ============================================================================
+# CONFIDENCE SCORE TABLES
+# ============================================================================
+# Scores are looked up instead of computed through if/elif cascades, so the
+# batch path is a searchsorted + gather and the kernel has no score branches.
+
+# Trend alignment (daily RSI). Bullish: <50 -> 20, <60 -> 15, <70 -> 10,
+# else 5 (searchsorted side="right"). Bearish: <=30 -> 5, <=40 -> 10,
+# <=50 -> 15, else 20 (searchsorted side="left").
+BULL_TREND_THRESHOLDS = np.array([50.0, 60.0, 70.0])
+BULL_TREND_SCORES = np.array([20, 15, 10, 5], dtype=np.int8)
+BEAR_TREND_THRESHOLDS = np.array([30.0, 40.0, 50.0])
+BEAR_TREND_SCORES = np.array([5, 10, 15, 20], dtype=np.int8)
+
+# Candle confirmation score indexed by candle code: strong reversal candles
+# get full points, pin bars partial points; index 0 is the reduced score used
+# when there is no candle confirmation
+CANDLE_SCORES = np.array([8, 20, 20, 20, 12, 20, 20, 20, 12], dtype=np.int8)
+NO_CANDLE_SCORE = 8
+
+# Fixed confidence components
+LEVEL_QUALITY_SCORE = 20
+MARKET_CONDITIONS_SCORE = 15
+
+
+# ============================================================================
+# KERNELS
+# ============================================================================
+
+@njit(cache=True, nogil=True)
+def _contains(codes, code):
+    """
+    Return True if code is one of codes (linear scan over a tiny array).
+    """
+    for c in codes:
+        if c == code:
+            return True
+    return False
+
+
+@njit(cache=True, nogil=True)
+def _round_half_up(x, scale):
+    """
+    Round x half up to the nearest 1/scale using plain arithmetic, which LLVM
+    inlines (and vectorizes in loops) instead of calling round().
+    """
+    return math.floor(x * scale + 0.5) / scale
+
+
+# (reason, entry, stop_loss, take_profit, rrr, confidence,
+#  flags, confluence_count, trend_score, candle_score)
+_RESULT_TYPE = "Tuple((i1,f8,f8,f8,f8,f8,i1,i1,i1,i1))"
+_KERNEL_SIGNATURE = _RESULT_TYPE + "(f8,f8,f8,f8,f8,f8,f8,f8,f8,i1,i1,b1)"
+_CORE_SIGNATURE = _RESULT_TYPE + "(f8,f8,f8,f8,f8,f8,f8,f8,f8,i1,i1,b1,b1)"
+
+
+def _make_core(rsi_oversold, rsi_overbought):
+    """
+    Build a kernel specialized for one pair of 4H RSI thresholds.
+
+    The thresholds are closure constants, so Numba folds them straight into
+    the comparisons instead of selecting them per bar from strict_mode.
+    """
+
+    @njit(_KERNEL_SIGNATURE, cache=True, nogil=True)
+    def _kernel(close, high, low, rsi_4h, rsi_daily, atr, ema50_daily,
+                swing_low, swing_high, candle_code, pattern_code, divergence):
+        """
+        Evaluate one validated 4H bar with the RSI thresholds of this
+        specialization.
+
+        Missing swing levels are passed as NaN. high/low are accepted for
+        signature stability with the request payload but do not affect the
+        decision.
+
+        Returns:
+            tuple: (reason, entry, stop_loss, take_profit, rrr, confidence,
+                    flags, confluence_count, trend_score, candle_score)
+                Prices and RRR are NaN unless reason is REASON_ALL_CONDITIONS_MET;
+                confidence is 0 when there are not enough confluences.
+        """
+
+        # ---------------------------------------------------------------------
+        # TREND FILTER
+        # ---------------------------------------------------------------------
+        # Price above the daily 50 EMA = uptrend, otherwise downtrend
+
+        bullish = close > ema50_daily
+
+        # ---------------------------------------------------------------------
+        # CONFLUENCE ANALYSIS
+        # ---------------------------------------------------------------------
+
+        if bullish:
+            # RSI oversold (strict mode: extremely oversold)
+            rsi_ok = rsi_4h <= rsi_oversold
+            candle_ok = _contains(BULLISH_CANDLE_CODES, candle_code)
+            pattern_match = _contains(BULLISH_PATTERN_CODES, pattern_code)
+            # Daily RSI should not be overbought
+            trend_ok = rsi_daily < 70
+        else:
+            # RSI overbought (strict mode: extremely overbought)
+            rsi_ok = rsi_4h >= rsi_overbought
+            candle_ok = _contains(BEARISH_CANDLE_CODES, candle_code)
+            pattern_match = _contains(BEARISH_PATTERN_CODES, pattern_code)
+            # Daily RSI should not be oversold
+            trend_ok = rsi_daily > 30
+
+        pattern_ok = pattern_match or divergence
+
+        # Branchless: booleans are summed/shifted as ints instead of incrementing
+        # under unpredictable branches
+        confluence_count = int(rsi_ok) + int(candle_ok) + int(pattern_ok) + int(trend_ok)
+        flags = (
+            int(bullish) * FLAG_BULLISH
+            | int(rsi_ok) * FLAG_RSI
+            | int(candle_ok) * FLAG_CANDLE
+            | int(pattern_match) * FLAG_PATTERN
+            | int(trend_ok) * FLAG_TREND
+        )
+
+        # At least 3 out of 4 confluences must be met
+        if confluence_count < 3:
+            return (REASON_NOT_ENOUGH_CONFLUENCES, math.nan, math.nan, math.nan,
+                    math.nan, 0.0, flags, confluence_count, 0, 0)
+
+        # ---------------------------------------------------------------------
+        # STOP LOSS & TAKE PROFIT
+        # ---------------------------------------------------------------------
+        # Stop distance is the larger of 1.0 x ATR and the distance to the recent
+        # swing low (long) / swing high (short). max(atr, nan) is atr, so a
+        # missing (NaN) swing level keeps the ATR-based stop.
+        #
+        # Written as one signed expression per level (direction = +1 long,
+        # -1 short) instead of per-direction branches, so LLVM emits a single
+        # max and multiply-add chain. Multiplying by +-1 and 2 is exact, so
+        # the results are bit-identical to the branched form.
+
+        entry_price = close
+        direction = 1.0 if bullish else -1.0
+        swing_level = swing_low if bullish else swing_high
+
+        sl_distance = max(atr, direction * (entry_price - swing_level))
+
+        # Take profit at a 2:1 risk-reward ratio
+        tp_distance = 2.0 * sl_distance
+
+        stop_loss = entry_price - direction * sl_distance
+        take_profit = entry_price + direction * tp_distance
+
+        entry_price = _round_half_up(entry_price, PRICE_SCALE)
+        stop_loss = _round_half_up(stop_loss, PRICE_SCALE)
+        take_profit = _round_half_up(take_profit, PRICE_SCALE)
+
+        # A zero stop distance is rejected by the final risk check below
+        if sl_distance != 0.0:
+            rrr = _round_half_up(tp_distance / sl_distance, RRR_SCALE)
+        else:
+            rrr = math.nan
+
+        # ---------------------------------------------------------------------
+        # CONFIDENCE SCORING
+        # ---------------------------------------------------------------------
+        # Confluences (25%) + Trend (20%) + Level (20%) + Candle (20%) + Market (15%)
+
+        if bullish:
+            trend_index = np.searchsorted(BULL_TREND_THRESHOLDS, rsi_daily, side="right")
+            trend_score = int(BULL_TREND_SCORES[trend_index])
+        else:
+            trend_index = np.searchsorted(BEAR_TREND_THRESHOLDS, rsi_daily, side="left")
+            trend_score = int(BEAR_TREND_SCORES[trend_index])
+
+        candle_score = int(CANDLE_SCORES[candle_code]) if candle_ok else NO_CANDLE_SCORE
+
+        # Integer arithmetic in tenths of a percent: the confluence component
+        # (count / 4 * 25) is rounded to one decimal as (count * 250 + 2) // 4
+        confidence_tenths = (confluence_count * 250 + 2) // 4 + 10 * (
+            trend_score + LEVEL_QUALITY_SCORE + candle_score + MARKET_CONDITIONS_SCORE
+        )
+        confidence_score = confidence_tenths / 10
+
+        # Minimum confidence requirement: 70%
+        if confidence_score < 70:
+            return (REASON_CONFIDENCE_TOO_LOW, math.nan, math.nan, math.nan,
+                    math.nan, confidence_score, flags, confluence_count,
+                    trend_score, candle_score)
+
+        # ---------------------------------------------------------------------
+        # FINAL RISK VALIDATION
+        # ---------------------------------------------------------------------
+        # Stop loss and take profit must be on the correct side of entry
+
+        if bullish:
+            valid_risk = stop_loss < entry_price and take_profit > entry_price
+        else:
+            valid_risk = stop_loss > entry_price and take_profit < entry_price
+
+        if not valid_risk:
+            return (REASON_INVALID_RISK_PARAMETERS, math.nan, math.nan, math.nan,
+                    math.nan, confidence_score, flags, confluence_count,
+                    trend_score, candle_score)
+
+        return (REASON_ALL_CONDITIONS_MET, entry_price, stop_loss, take_profit,
+                rrr, confidence_score, flags, confluence_count, trend_score,
+                candle_score)
+
+    return _kernel
+
+
+# One specialization per RSI mode, compiled (or loaded from cache) at import
+_evaluate_core_normal = _make_core(RSI_OVERSOLD, RSI_OVERBOUGHT)
+_evaluate_core_strict = _make_core(RSI_OVERSOLD_STRICT, RSI_OVERBOUGHT_STRICT)
+
+
+@njit(_CORE_SIGNATURE, cache=True, nogil=True)
+def _evaluate_core(close, high, low, rsi_4h, rsi_daily, atr, ema50_daily,
+                   swing_low, swing_high, candle_code, pattern_code,
+                   divergence, strict_mode):
+    """
+    Evaluate one validated 4H bar, dispatching once on strict_mode to the
+    matching specialized kernel (see _make_core for the return tuple).
+    """
+    if strict_mode:
+        return _evaluate_core_strict(close, high, low, rsi_4h, rsi_daily,
+                                     atr, ema50_daily, swing_low, swing_high,
+                                     candle_code, pattern_code, divergence)
+    return _evaluate_core_normal(close, high, low, rsi_4h, rsi_daily, atr,
+                                 ema50_daily, swing_low, swing_high,
+                                 candle_code, pattern_code, divergence)
+
+
+@njit(parallel=True, cache=True)
+def _backtest_core(close, high, low, rsi_4h, rsi_daily, atr, ema50_daily,
+                   swing_low, swing_high, candle_code, pattern_code,
+                   divergence, strict_mode):
+    """
+    Evaluate a whole bar series, one _evaluate_core call per bar, with the
+    bars split across cores by prange.
+
+    All inputs are equal-length 1-D arrays (float64, int8 codes, bool flags).
+
+    Returns:
+        tuple: Arrays (reason, entry, stop_loss, take_profit, rrr, confidence,
+               flags, confluence_count, trend_score, candle_score), one
+               element per bar, with the same meaning as _evaluate_core.
+    """
+    n = close.shape[0]
+    reason = np.empty(n, dtype=np.int8)
+    entry = np.empty(n, dtype=np.float64)
+    stop_loss = np.empty(n, dtype=np.float64)
+    take_profit = np.empty(n, dtype=np.float64)
+    rrr = np.empty(n, dtype=np.float64)
+    confidence = np.empty(n, dtype=np.float64)
+    flags = np.empty(n, dtype=np.int8)
+    confluence_count = np.empty(n, dtype=np.int8)
+    trend_score = np.empty(n, dtype=np.int8)
+    candle_score = np.empty(n, dtype=np.int8)
+
+    # Bars are independent, so each iteration writes only its own slot
+    for i in prange(n):
+        result = _evaluate_core(close[i], high[i], low[i], rsi_4h[i],
+                                rsi_daily[i], atr[i], ema50_daily[i],
+                                swing_low[i], swing_high[i], candle_code[i],
+                                pattern_code[i], divergence[i], strict_mode[i])
+        reason[i] = result[0]
+        entry[i] = result[1]
+        stop_loss[i] = result[2]
+        take_profit[i] = result[3]
+        rrr[i] = result[4]
+        confidence[i] = result[5]
+        flags[i] = result[6]
+        confluence_count[i] = result[7]
+        trend_score[i] = result[8]
+        candle_score[i] = result[9]
+
+    return (reason, entry, stop_loss, take_profit, rrr, confidence, flags,
+            confluence_count, trend_score, candle_score)
+
+
+def warmup():
+    """
+    Run every kernel once with dummy values.
+
+    The typed kernels are compiled (or loaded from the on-disk cache) at
+    import; running each specialization once also takes the first-call
+    dispatch and page-in cost out of the first real request, and compiles
+    the lazily typed backtest kernel. Call it at application startup.
+    """
+    for strict_mode in (False, True):
+        for ema50_daily in (0.9, 1.1):  # bullish and bearish branches
+            _evaluate_core(1.0, 1.0, 1.0, 50.0, 50.0, 0.01, ema50_daily,
+                           math.nan, math.nan, 0, 0, False, strict_mode)
+
+    # The parallel backtest kernel is compiled on first use; compile (or
+    # load) it here too
+    prices = np.ones(2)
+    flags = np.zeros(2, dtype=np.bool_)
+    codes = np.zeros(2, dtype=np.int8)
+    _backtest_core(prices, prices, prices, prices, prices, prices, prices,
+                   prices, prices, codes, codes, flags, flags)
@@ -0,0 +1,79 @@
+"""
+Native Core Parity Check
+
+Compares the Rust build of the scalar kernels (signal_core) against the
+Numba kernel in agent_core.py on randomized bars, including the edge cases
+the kernels must agree on: values exactly on the RSI and trend thresholds,
+NaN indicators and swing levels, zero and negative ATR, and every candle
+and pattern code.
+
+Run from the repository root after building the extension:
+    maturin develop --release -m rust/signal_core/Cargo.toml
+    python rust/signal_core/parity.py [bars]
+
+Exits with status 1 (printing the first mismatches) if any bar differs.
+Prices, RRR and confidence must match bit for bit; NaN matches NaN.
+"""
+
+import math
+import random
+import struct
+import sys
+from pathlib import Path
+
+# agent_core.py sits at the repository root, two levels up
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agent_core import _evaluate_core  # noqa: E402
+from signal_core import evaluate_core  # noqa: E402
+
+NAN = math.nan
+
+
+def _random_bar(rng):
+    """
+    Build one argument tuple for evaluate_core, biased towards the values
+    where the two builds could disagree.
+    """
+    close = rng.choice([1.0, 1.23456, 100.0, rng.uniform(0.5, 2.0)])
+    ema50_daily = rng.choice([close, close * 0.99, close * 1.01, NAN])
+    rsi_4h = rng.choice([5.0, 20.0, 80.0, 95.0, rng.uniform(0, 100), NAN])
+    rsi_daily = rng.choice([30.0, 40.0, 50.0, 60.0, 70.0, rng.uniform(0, 100), NAN])
+    atr = rng.choice([0.0, -0.01, 0.01, rng.uniform(0, 0.1), NAN])
+    swing_low = rng.choice([NAN, close - rng.uniform(-0.05, 0.1)])
+    swing_high = rng.choice([NAN, close + rng.uniform(-0.05, 0.1)])
+    return (
+        close, close, close, rsi_4h, rsi_daily, atr, ema50_daily,
+        swing_low, swing_high, rng.randint(0, 8), rng.randint(0, 10),
+        rng.random() < 0.5, rng.random() < 0.5,
+    )
+
+
+def _same(a, b):
+    """
+    Field equality: floats bit for bit (any NaN equals any NaN), ints by value.
+    """
+    if isinstance(a, float) or isinstance(b, float):
+        if math.isnan(a) or math.isnan(b):
+            return math.isnan(a) and math.isnan(b)
+        return struct.pack("d", a) == struct.pack("d", b)
+    return a == b
+
+
+def main(bars=200_000):
+    rng = random.Random(0)
+    mismatches = 0
+    for _ in range(bars):
+        args = _random_bar(rng)
+        expected = _evaluate_core(*args)
+        actual = evaluate_core(*args)
+        if not all(_same(a, b) for a, b in zip(expected, actual)):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"mismatch for {args}:\n  numba {expected}\n  rust  {actual}")
+    print(f"{bars} bars, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
@@ -0,0 +1,383 @@
+//! Native Signal Core
+//!
+//! Rust port of the numeric kernels in agent_core.py (trend decision,
+//! confluence counting, SL/TP/RRR, confidence scoring and the final sanity
+//! check), exposed to Python with PyO3.
+//!
+//! The functions take and return exactly what the Numba kernels
+//! `_evaluate_core_normal` / `_evaluate_core_strict` / `_evaluate_core` do,
+//! so agent.py can use either build interchangeably. The code tables below
+//! mirror agent_core.py and must be kept in sync with it; parity.py checks
+//! the two builds against each other.
+//!
+//! The crate lives outside the repository's import path: a bare
+//! signal_core/ source directory next to agent.py would shadow the built
+//! module as a namespace package.
+//!
+//! Build and install into the current environment, then check parity
+//! (from the repository root):
+//!     pip install maturin
+//!     maturin develop --release -m rust/signal_core/Cargo.toml
+//!     python rust/signal_core/parity.py
+
+use pyo3::prelude::*;
+
+// ============================================================================
+// TABLES (mirror agent_core.py)
+// ============================================================================
+
+// Reason codes
+const REASON_ALL_CONDITIONS_MET: i8 = 0;
+const REASON_NOT_ENOUGH_CONFLUENCES: i8 = 1;
+const REASON_CONFIDENCE_TOO_LOW: i8 = 2;
+const REASON_INVALID_RISK_PARAMETERS: i8 = 3;
+
+// Bit flags describing the trend and which confluences were met
+const FLAG_BULLISH: i8 = 1;
+const FLAG_RSI: i8 = 2;
+const FLAG_CANDLE: i8 = 4;
+const FLAG_PATTERN: i8 = 8;
+const FLAG_TREND: i8 = 16;
+
+// 4H RSI extremes: normal mode 20/80, strict mode 5/95
+const RSI_OVERSOLD: f64 = 20.0;
+const RSI_OVERBOUGHT: f64 = 80.0;
+const RSI_OVERSOLD_STRICT: f64 = 5.0;
+const RSI_OVERBOUGHT_STRICT: f64 = 95.0;
+
+// Output precision: prices to 5 decimals, RRR to 2 decimals
+const PRICE_SCALE: f64 = 1e5;
+const RRR_SCALE: f64 = 1e2;
+
+// Confidence score tables (see agent_core.py for the thresholds' meaning)
+const BULL_TREND_THRESHOLDS: [f64; 3] = [50.0, 60.0, 70.0];
+const BULL_TREND_SCORES: [i8; 4] = [20, 15, 10, 5];
+const BEAR_TREND_THRESHOLDS: [f64; 3] = [30.0, 40.0, 50.0];
+const BEAR_TREND_SCORES: [i8; 4] = [5, 10, 15, 20];
+const CANDLE_SCORES: [i8; 9] = [8, 20, 20, 20, 12, 20, 20, 20, 12];
+const NO_CANDLE_SCORE: i8 = 8;
+const LEVEL_QUALITY_SCORE: i32 = 20;
+const MARKET_CONDITIONS_SCORE: i32 = 15;
+
+/// (reason, entry, stop_loss, take_profit, rrr, confidence,
+///  flags, confluence_count, trend_score, candle_score)
+type CoreResult = (i8, f64, f64, f64, f64, f64, i8, i8, i8, i8);
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+/// Round x half up to the nearest 1/scale (same arithmetic as the Numba
+/// kernel, so results are bit-identical).
+#[inline(always)]
+fn round_half_up(x: f64, scale: f64) -> f64 {
+    (x * scale + 0.5).floor() / scale
+}
+
+/// Python's max(a, b): b only if b > a, so max(atr, NaN) is atr.
+#[inline(always)]
+fn py_max(a: f64, b: f64) -> f64 {
+    if b > a {
+        b
+    } else {
+        a
+    }
+}
+
+/// np.searchsorted over a sorted 3-element table. NaN sorts after every
+/// number, as in NumPy.
+#[inline(always)]
+fn searchsorted(thresholds: &[f64; 3], x: f64, side_right: bool) -> usize {
+    if x.is_nan() {
+        return thresholds.len();
+    }
+    thresholds
+        .iter()
+        .filter(|&&t| if side_right { t <= x } else { t < x })
+        .count()
+}
+
+// ============================================================================
+// KERNEL
+// ============================================================================
+
+/// Evaluate one validated 4H bar. STRICT selects the RSI thresholds at
+/// compile time, so each specialization compares against constants.
+#[allow(clippy::too_many_arguments)]
+#[inline(always)]
+fn evaluate<const STRICT: bool>(
+    close: f64,
+    rsi_4h: f64,
+    rsi_daily: f64,
+    atr: f64,
+    ema50_daily: f64,
+    swing_low: f64,
+    swing_high: f64,
+    candle_code: i8,
+    pattern_code: i8,
+    divergence: bool,
+) -> CoreResult {
+    let (rsi_oversold, rsi_overbought) = if STRICT {
+        (RSI_OVERSOLD_STRICT, RSI_OVERBOUGHT_STRICT)
+    } else {
+        (RSI_OVERSOLD, RSI_OVERBOUGHT)
+    };
+
+    // ---------------------------------------------------------------------
+    // TREND FILTER
+    // ---------------------------------------------------------------------
+    // Price above the daily 50 EMA = uptrend, otherwise downtrend
+
+    let bullish = close > ema50_daily;
+
+    // ---------------------------------------------------------------------
+    // CONFLUENCE ANALYSIS
+    // ---------------------------------------------------------------------
+
+    let (rsi_ok, candle_ok, pattern_match, trend_ok) = if bullish {
+        (
+            rsi_4h <= rsi_oversold,
+            (1..=4).contains(&candle_code),
+            (1..=5).contains(&pattern_code),
+            rsi_daily < 70.0,
+        )
+    } else {
+        (
+            rsi_4h >= rsi_overbought,
+            (5..=8).contains(&candle_code),
+            (6..=10).contains(&pattern_code),
+            rsi_daily > 30.0,
+        )
+    };
+    let pattern_ok = pattern_match || divergence;
+
+    let confluence_count =
+        rsi_ok as i8 + candle_ok as i8 + pattern_ok as i8 + trend_ok as i8;
+    let flags = (bullish as i8) * FLAG_BULLISH
+        | (rsi_ok as i8) * FLAG_RSI
+        | (candle_ok as i8) * FLAG_CANDLE
+        | (pattern_match as i8) * FLAG_PATTERN
+        | (trend_ok as i8) * FLAG_TREND;
+
+    // At least 3 out of 4 confluences must be met
+    if confluence_count < 3 {
+        return (
+            REASON_NOT_ENOUGH_CONFLUENCES,
+            f64::NAN,
+            f64::NAN,
+            f64::NAN,
+            f64::NAN,
+            0.0,
+            flags,
+            confluence_count,
+            0,
+            0,
+        );
+    }
+
+    // ---------------------------------------------------------------------
+    // STOP LOSS & TAKE PROFIT
+    // ---------------------------------------------------------------------
+    // Larger of 1.0 x ATR and the distance to the swing level; a missing
+    // (NaN) swing level keeps the ATR-based stop. Take profit at 2:1.
+
+    let direction = if bullish { 1.0 } else { -1.0 };
+    let swing_level = if bullish { swing_low } else { swing_high };
+
+    let sl_distance = py_max(atr, direction * (close - swing_level));
+    let tp_distance = 2.0 * sl_distance;
+
+    let entry_price = round_half_up(close, PRICE_SCALE);
+    let stop_loss = round_half_up(close - direction * sl_distance, PRICE_SCALE);
+    let take_profit = round_half_up(close + direction * tp_distance, PRICE_SCALE);
+
+    // A zero stop distance is rejected by the final risk check below
+    let rrr = if sl_distance != 0.0 {
+        round_half_up(tp_distance / sl_distance, RRR_SCALE)
+    } else {
+        f64::NAN
+    };
+
+    // ---------------------------------------------------------------------
+    // CONFIDENCE SCORING
+    // ---------------------------------------------------------------------
+    // Confluences (25%) + Trend (20%) + Level (20%) + Candle (20%) + Market (15%)
+
+    let trend_score = if bullish {
+        BULL_TREND_SCORES[searchsorted(&BULL_TREND_THRESHOLDS, rsi_daily, true)]
+    } else {
+        BEAR_TREND_SCORES[searchsorted(&BEAR_TREND_THRESHOLDS, rsi_daily, false)]
+    };
+
+    let candle_score = if candle_ok {
+        CANDLE_SCORES[candle_code as usize]
+    } else {
+        NO_CANDLE_SCORE
+    };
+
+    // Integer arithmetic in tenths of a percent, as in the Numba kernel
+    let confidence_tenths = (confluence_count as i32 * 250 + 2) / 4
+        + 10 * (trend_score as i32
+            + LEVEL_QUALITY_SCORE
+            + candle_score as i32
+            + MARKET_CONDITIONS_SCORE);
+    let confidence_score = confidence_tenths as f64 / 10.0;
+
+    // Minimum confidence requirement: 70%
+    if confidence_score < 70.0 {
+        return (
+            REASON_CONFIDENCE_TOO_LOW,
+            f64::NAN,
+            f64::NAN,
+            f64::NAN,
+            f64::NAN,
+            confidence_score,
+            flags,
+            confluence_count,
+            trend_score,
+            candle_score,
+        );
+    }
+
+    // ---------------------------------------------------------------------
+    // FINAL RISK VALIDATION
+    // ---------------------------------------------------------------------
+    // Stop loss and take profit must be on the correct side of entry
+
+    let valid_risk = if bullish {
+        stop_loss < entry_price && take_profit > entry_price
+    } else {
+        stop_loss > entry_price && take_profit < entry_price
+    };
+
+    if !valid_risk {
+        return (
+            REASON_INVALID_RISK_PARAMETERS,
+            f64::NAN,
+            f64::NAN,
+            f64::NAN,
+            f64::NAN,
+            confidence_score,
+            flags,
+            confluence_count,
+            trend_score,
+            candle_score,
+        );
+    }
+
+    (
+        REASON_ALL_CONDITIONS_MET,
+        entry_price,
+        stop_loss,
+        take_profit,
+        rrr,
+        confidence_score,
+        flags,
+        confluence_count,
+        trend_score,
+        candle_score,
+    )
+}
+
+// ============================================================================
+// PYTHON BINDINGS
+// ============================================================================
+// high/low are accepted for signature stability with the Numba kernels but
+// do not affect the decision. The work per call is a few dozen nanoseconds,
+// less than releasing and re-acquiring the GIL would cost, so the calls hold
+// the GIL.
+
+/// Evaluate one bar with the normal (20/80) 4H RSI thresholds.
+#[pyfunction]
+#[pyo3(text_signature = "(close, high, low, rsi_4h, rsi_daily, atr, ema50_daily, \
+                         swing_low, swing_high, candle_code, pattern_code, divergence)")]
+#[allow(clippy::too_many_arguments)]
+fn evaluate_core_normal(
+    close: f64,
+    high: f64,
+    low: f64,
+    rsi_4h: f64,
+    rsi_daily: f64,
+    atr: f64,
+    ema50_daily: f64,
+    swing_low: f64,
+    swing_high: f64,
+    candle_code: i8,
+    pattern_code: i8,
+    divergence: bool,
+) -> CoreResult {
+    let _ = (high, low);
+    evaluate::<false>(
+        close, rsi_4h, rsi_daily, atr, ema50_daily, swing_low, swing_high,
+        candle_code, pattern_code, divergence,
+    )
+}
+
+/// Evaluate one bar with the strict (5/95) 4H RSI thresholds.
+#[pyfunction]
+#[pyo3(text_signature = "(close, high, low, rsi_4h, rsi_daily, atr, ema50_daily, \
+                         swing_low, swing_high, candle_code, pattern_code, divergence)")]
+#[allow(clippy::too_many_arguments)]
+fn evaluate_core_strict(
+    close: f64,
+    high: f64,
+    low: f64,
+    rsi_4h: f64,
+    rsi_daily: f64,
+    atr: f64,
+    ema50_daily: f64,
+    swing_low: f64,
+    swing_high: f64,
+    candle_code: i8,
+    pattern_code: i8,
+    divergence: bool,
+) -> CoreResult {
+    let _ = (high, low);
+    evaluate::<true>(
+        close, rsi_4h, rsi_daily, atr, ema50_daily, swing_low, swing_high,
+        candle_code, pattern_code, divergence,
+    )
+}
+
+/// Evaluate one bar, dispatching once on strict_mode.
+#[pyfunction]
+#[pyo3(text_signature = "(close, high, low, rsi_4h, rsi_daily, atr, ema50_daily, \
+                         swing_low, swing_high, candle_code, pattern_code, divergence, \
+                         strict_mode)")]
+#[allow(clippy::too_many_arguments)]
+fn evaluate_core(
+    close: f64,
+    high: f64,
+    low: f64,
+    rsi_4h: f64,
+    rsi_daily: f64,
+    atr: f64,
+    ema50_daily: f64,
+    swing_low: f64,
+    swing_high: f64,
+    candle_code: i8,
+    pattern_code: i8,
+    divergence: bool,
+    strict_mode: bool,
+) -> CoreResult {
+    let _ = (high, low);
+    if strict_mode {
+        evaluate::<true>(
+            close, rsi_4h, rsi_daily, atr, ema50_daily, swing_low, swing_high,
+            candle_code, pattern_code, divergence,
+        )
+    } else {
+        evaluate::<false>(
+            close, rsi_4h, rsi_daily, atr, ema50_daily, swing_low, swing_high,
+            candle_code, pattern_code, divergence,
+        )
+    }
+}
+
+#[pymodule]
+fn signal_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add_function(wrap_pyfunction!(evaluate_core_normal, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_core_strict, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_core, m)?)?;
+    Ok(())
+}
@@ -0,0 +1,39 @@
+"""
+Optional native build for the signal agent.
+
+Compiles agent.py to a C extension with mypyc, using the type annotations
+already present in the module. The compiled agent.cpython-*.so sits next to
+agent.py and is picked up by `import agent` automatically; removing the .so
+falls back to the pure-Python module. SignalResult stays a regular Python
+class in the build (mypyc_attr(native_class=False)) so orjson can still
+serialize it.
+
+Build in place:
+    pip install mypy
+    python setup.py build_ext --inplace
+
+agent_core.py is not compiled here: its kernels are already compiled by
+Numba and must stay plain Python functions for @njit. The optional Rust
+build of the scalar kernels lives in rust/signal_core/ (outside the import
+path) and is built separately:
+    pip install maturin
+    maturin develop --release -m rust/signal_core/Cargo.toml
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:  # mypy not installed - ship the pure-Python module
+    ext_modules = []
+else:
+    ext_modules = mypycify(["agent.py"])
+
+
+setup(
+    name="signal-provider-ai-agent",
+    # main.py is the server entry point, run from the checkout - not
+    # installed as a generic top-level "main" module
+    py_modules=["agent", "agent_core"],
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,9 @@
+"""
+Test configuration: make the top-level modules (agent, agent_core, main)
+importable when pytest is run from any directory.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,219 @@
+"""
+Signal Agent Tests
+
+The signal rules are implemented more than once: the compiled scalar
+kernels behind evaluate_signal, the NumPy batch path behind
+evaluate_signals_batch, the parallel backtest kernel and (optionally) the
+Rust build in rust/signal_core/. These tests check that they agree on
+randomized bars, pin the documented rounding behaviour, and check the
+status codes of the HTTP endpoints.
+
+Run from the repository root:
+    pip install -r requirements.txt -r requirements-dev.txt
+    python -m pytest
+"""
+
+import math
+import random
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from agent import (
+    REASONS,
+    evaluate_signal,
+    evaluate_signals_batch,
+    backtest_signals,
+)
+from agent_core import _evaluate_core, _round_half_up
+
+BARS = 3000
+
+CANDLES = [None, "", "hammer", "Hammer", "bullish_engulfing", "morning_star",
+           "bullish_pin_bar", "shooting_star", "bearish_engulfing",
+           "evening_star", "bearish_pin_bar", "doji"]
+PATTERNS = [None, "", "double_bottom", "inverse_head_shoulders",
+            "ascending_triangle", "bullish_flag", "cup_and_handle",
+            "double_top", "head_shoulders", "descending_triangle",
+            "bearish_flag", "rising_wedge", "wedge"]
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def _random_bar(rng):
+    """
+    One valid 4H payload, biased towards the RSI and trend thresholds and
+    the optional swing levels, where the implementations could disagree.
+    """
+    close = rng.uniform(0.5, 2.0)
+    return {
+        "instrument": "EURUSD",
+        "timeframe": "4H",
+        "timestamp": "2024-01-15T10:00:00Z",
+        "close": close,
+        "high": close * 1.01,
+        "low": close * 0.99,
+        "rsi_4h": rng.choice([rng.uniform(0, 100), 5.0, 20.0, 80.0, 95.0,
+                              rng.uniform(0, 25), rng.uniform(75, 100)]),
+        "rsi_daily": rng.choice([rng.uniform(0, 100), 30.0, 40.0, 50.0, 60.0, 70.0]),
+        "atr": rng.choice([rng.uniform(0, 0.05), 0.0025, 0.0]),
+        "ema50_daily": close * rng.uniform(0.95, 1.05),
+        "candle_type": rng.choice(CANDLES),
+        "pattern": rng.choice(PATTERNS),
+        "divergence": rng.choice([True, False]),
+        "strict_mode": rng.choice([False, False, False, True]),
+        "recent_swing_low": rng.choice([None, close * rng.uniform(0.9, 1.0)]),
+        "recent_swing_high": rng.choice([None, close * rng.uniform(1.0, 1.1)]),
+        "include_message": True,
+    }
+
+
+@pytest.fixture(scope="module")
+def bars():
+    rng = random.Random(0)
+    return [_random_bar(rng) for _ in range(BARS)]
+
+
+@pytest.fixture(scope="module")
+def columns(bars):
+    return {key: [bar[key] for bar in bars] for key in bars[0]}
+
+
+@pytest.fixture(scope="module")
+def client():
+    # The context manager runs the startup hooks (warmup, micro-batcher,
+    # worker pool)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+# ============================================================================
+# IMPLEMENTATION AGREEMENT
+# ============================================================================
+
+def test_batch_matches_scalar(bars, columns):
+    expected = [evaluate_signal(bar) for bar in bars]
+    assert evaluate_signals_batch(columns) == expected
+
+
+def test_backtest_matches_scalar(bars, columns):
+    result = backtest_signals(columns)
+    statuses = {1: "long", -1: "short", 0: "no_trade"}
+
+    for i, bar in enumerate(bars):
+        signal = evaluate_signal(bar)
+        assert statuses[int(result["signal"][i])] == signal.status
+        assert REASONS[result["reason"][i]] == signal.reason
+        assert result["confidence"][i] == signal.confidence
+        for field in ("entry", "stop_loss", "take_profit", "rrr"):
+            value = getattr(signal, field)
+            if value is None:
+                assert math.isnan(result[field][i])
+            else:
+                assert result[field][i] == value
+
+
+def test_native_core_matches_numba(bars):
+    signal_core = pytest.importorskip("signal_core")
+    for bar in bars:
+        args = (
+            bar["close"], bar["high"], bar["low"], bar["rsi_4h"],
+            bar["rsi_daily"], bar["atr"], bar["ema50_daily"],
+            math.nan if bar["recent_swing_low"] is None else bar["recent_swing_low"],
+            math.nan if bar["recent_swing_high"] is None else bar["recent_swing_high"],
+            main.encode_pattern(bar["candle_type"], main.CANDLE_CODES),
+            main.encode_pattern(bar["pattern"], main.PATTERN_CODES),
+            bar["divergence"], bar["strict_mode"],
+        )
+        expected = _evaluate_core(*args)
+        actual = signal_core.evaluate_core(*args)
+        for a, b in zip(expected, actual):
+            assert a == b or (math.isnan(a) and math.isnan(b))
+
+
+# ============================================================================
+# ROUNDING
+# ============================================================================
+
+def test_prices_round_half_up():
+    # Exactly representable halves round up, unlike round()'s half-even
+    assert _round_half_up(0.125, 1e2) == 0.13
+    assert round(0.125, 2) == 0.12
+    assert _round_half_up(2.5, 1.0) == 3.0
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+def test_fast_path_status_codes(client):
+    ok = client.post("/generate-signal", json=main._EXAMPLE)
+    assert ok.status_code == 200
+    assert ok.json()["status"] == "long"
+
+    not_modified = client.post(
+        "/generate-signal", json=main._EXAMPLE,
+        headers={"If-None-Match": ok.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+
+    bad_json = client.post("/generate-signal", content=b"{not json",
+                           headers={"Content-Type": "application/json"})
+    assert bad_json.status_code == 400
+
+    not_object = client.post("/generate-signal", json=[main._EXAMPLE])
+    assert not_object.status_code == 400
+
+    bad_field = client.post("/generate-signal", json={**main._EXAMPLE, "close": "abc"})
+    assert bad_field.status_code == 422
+
+
+def test_validated_status_codes(client):
+    ok = client.post("/generate-signal/validated", json=main._EXAMPLE)
+    assert ok.status_code == 200
+    assert ok.json() == client.post("/generate-signal", json=main._EXAMPLE).json()
+
+    # Same body, same validator on both routes
+    not_modified = client.post(
+        "/generate-signal/validated", content=orjson.dumps(main._EXAMPLE),
+        headers={"If-None-Match": ok.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+
+    missing = {k: v for k, v in main._EXAMPLE.items() if k != "close"}
+    assert client.post("/generate-signal/validated", json=missing).status_code == 422
+
+    bool_pattern = {**main._EXAMPLE, "candle_type": True}
+    assert client.post("/generate-signal/validated", json=bool_pattern).status_code == 422
+
+
+def test_out_of_range_pattern_codes_are_ignored(client):
+    # 257 would wrap to int8 1 (a hammer) without the range check
+    plain = {**main._EXAMPLE, "candle_type": None}
+    wrapped = {**main._EXAMPLE, "candle_type": 257}
+    for route in ("/generate-signal", "/generate-signal/validated"):
+        expected = client.post(route, json=plain).json()
+        got = client.post(route, json=wrapped).json()
+        assert got["confidence"] == expected["confidence"]
+
+
+def test_bulk_endpoints(client):
+    batch = client.post("/generate-signals-batch",
+                        json={"items": [main._EXAMPLE, {**main._EXAMPLE, "timeframe": "1H"}]})
+    assert batch.status_code == 200
+    assert [s["status"] for s in batch.json()] == ["long", "no_trade"]
+
+    invalid = client.post("/generate-signals-batch",
+                          json={"items": [{**main._EXAMPLE, "close": "abc"}]})
+    assert invalid.status_code == 422
+
+    raw = client.post("/generate-signals-raw",
+                      json=[main._EXAMPLE, {**main._EXAMPLE, "close": "abc"}])
+    assert raw.status_code == 200
+    assert [s["reason"] for s in raw.json()] == ["all_conditions_met", "data_invalid"]
+
+    assert client.post("/generate-signals-raw", json=main._EXAMPLE).status_code == 400